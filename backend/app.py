@@ -1,13 +1,24 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+import os
 import uuid
 import json
 from datetime import datetime
 from config import Config
-from database import get_db_cursor, init_db
+from database import get_db_cursor, init_db, begin_request, issue_write_token, parse_write_token
 from auth import login_admin, logout_admin, require_admin_auth, clean_expired_sessions
 from validators import validate_resume_data, sanitize_resume_data
-from pdf_generator import generate_resume_pdf
+from pdf_generator import RenderLimitExceeded
+from latex_generator import LatexPoolBusy
+from renderers import get_renderer
+from resume_record import fetch_resume, RESUME_COLUMNS
+from pdf_cache import normalize_resume_id, get_cached_file, store_rendered_file, invalidate_cached_files
+from dedup import (
+    compute_content_hash, find_by_idempotency_key, find_by_content_hash, insert_or_find,
+    record_idempotency_key, record_dedup_hit, get_dedup_stats, clean_expired_idempotency_keys
+)
+from stats import record_resume_added, get_dashboard_stats
+from cleanup import maybe_run_maintenance, delete_resume_rows, parse_bulk_delete_criteria, start_bulk_delete, get_bulk_delete_job
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -16,15 +27,103 @@ CORS(app, resources={
     r"/api/*": {
         "origins": Config.ALLOWED_ORIGINS,
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key", "X-Last-Write"],
+        "expose_headers": ["X-Last-Write"]
     }
 })
 
 @app.before_request
 def before_request():
+    begin_request(parse_write_token(request.headers.get('X-Last-Write')))
+
     if request.method == 'OPTIONS':
         return '', 204
 
+    maybe_run_maintenance()
+
+@app.after_request
+def after_request(response):
+    # Clients echo this back so their next reads skip replicas that may not have the write yet
+    write_token = issue_write_token()
+    if write_token:
+        response.headers['X-Last-Write'] = write_token
+    return response
+
+def send_rendered_resume(resume, renderer):
+    output = renderer.render(resume)
+    filename = f"{resume.full_name.replace(' ', '_')}_resume.{renderer.extension}"
+
+    if renderer.streaming:
+        response = Response(stream_with_context(output), mimetype=renderer.mimetype)
+        response.headers.set('Content-Disposition', 'attachment', filename=filename)
+        return response
+
+    return send_file(
+        output,
+        mimetype=renderer.mimetype,
+        as_attachment=True,
+        download_name=filename
+    )
+
+def send_cached_resume(path, renderer, full_name):
+    filename = f"{full_name.replace(' ', '_')}_resume.{renderer.extension}"
+
+    if Config.PDF_ACCEL_REDIRECT_PREFIX:
+        response = Response(mimetype=renderer.mimetype)
+        response.headers['X-Accel-Redirect'] = f"{Config.PDF_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{os.path.basename(path)}"
+        response.headers.set('Content-Disposition', 'attachment', filename=filename)
+        return response
+
+    # Served from disk: Range requests, conditional GETs and wsgi.file_wrapper/X-Sendfile come for free
+    return send_file(
+        path,
+        mimetype=renderer.mimetype,
+        as_attachment=True,
+        download_name=filename,
+        conditional=True
+    )
+
+def download_resume(resume_id):
+    renderer = get_renderer(request.args.get('format'))
+    if not renderer:
+        return jsonify({'error': 'Unsupported format'}), 400
+    if not renderer.available():
+        return jsonify({'error': f"Format '{renderer.name}' is not available on this server"}), 503
+
+    resume_id = normalize_resume_id(resume_id)
+    if not resume_id:
+        return jsonify({'error': 'Resume not found'}), 404
+
+    try:
+        cached_path = get_cached_file(resume_id, renderer) if renderer.cacheable else None
+
+        resume = fetch_resume(resume_id, ('full_name',) if cached_path else RESUME_COLUMNS)
+
+        if not resume:
+            if cached_path:
+                invalidate_cached_files([resume_id])
+            return jsonify({'error': 'Resume not found'}), 404
+
+        if cached_path:
+            return send_cached_resume(cached_path, renderer, resume.full_name)
+
+        if renderer.cacheable:
+            return send_cached_resume(store_rendered_file(resume_id, renderer, resume), renderer, resume.full_name)
+
+        return send_rendered_resume(resume, renderer)
+
+    except RenderLimitExceeded as e:
+        app.logger.warning(f"PDF render limit exceeded for {resume_id}: {str(e)}")
+        return jsonify({'error': 'Resume is too large to render'}), 422
+
+    except LatexPoolBusy as e:
+        app.logger.warning(f"LaTeX compile queue full for {resume_id}: {str(e)}")
+        return jsonify({'error': 'Server is busy, please try again shortly'}), 503
+
+    except Exception as e:
+        app.logger.error(f"Error generating PDF: {str(e)}")
+        return jsonify({'error': 'Failed to generate PDF'}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
@@ -66,44 +165,95 @@ def submit_resume():
     if content_length > Config.MAX_RESUME_SIZE:
         return jsonify({'error': 'Payload too large'}), 413
 
-    data = request.get_json()
+    # Content-Length may be absent (chunked uploads), so also bound what is actually read
+    body = request.stream.read(Config.MAX_RESUME_SIZE + 1)
+    if len(body) > Config.MAX_RESUME_SIZE:
+        return jsonify({'error': 'Payload too large'}), 413
 
-    if not data:
+    try:
+        data = json.loads(body) if body else None
+    except (ValueError, RecursionError):
+        return jsonify({'error': 'Invalid JSON'}), 400
+
+    if not data or not isinstance(data, dict):
         return jsonify({'error': 'No data provided'}), 400
 
     errors = validate_resume_data(data)
     if errors:
         return jsonify({'error': 'Validation failed', 'details': errors}), 400
 
-    sanitized_data = sanitize_resume_data(data)
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+        return jsonify({'error': 'Invalid Idempotency-Key header'}), 400
 
-    resume_id = str(uuid.uuid4())
+    sanitized_data = sanitize_resume_data(data)
+    content_hash = compute_content_hash(sanitized_data)
 
     try:
         with get_db_cursor(commit=True) as cursor:
-            cursor.execute(
-                """
-                INSERT INTO resumes (
-                    id, user_email, full_name, phone, social_links,
-                    profile_summary, education, technical_skills,
-                    work_experience, projects, languages, certifications
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    resume_id,
-                    sanitized_data['user_email'],
-                    sanitized_data['full_name'],
-                    sanitized_data.get('phone'),
-                    json.dumps(sanitized_data.get('social_links', {})),
-                    sanitized_data.get('profile_summary'),
-                    json.dumps(sanitized_data.get('education', [])),
-                    json.dumps(sanitized_data.get('technical_skills', {})),
-                    json.dumps(sanitized_data.get('work_experience', [])),
-                    json.dumps(sanitized_data.get('projects', [])),
-                    json.dumps(sanitized_data.get('languages', [])),
-                    json.dumps(sanitized_data.get('certifications', []))
+            existing_id = None
+            dedup_source = None
+
+            if idempotency_key:
+                previous = find_by_idempotency_key(cursor, idempotency_key)
+                if previous and previous['content_hash'] != content_hash:
+                    return jsonify({'error': 'Idempotency-Key was already used with a different resume'}), 422
+                if previous:
+                    existing_id = previous['resume_id']
+                    dedup_source = 'idempotency_key'
+
+            if not existing_id:
+                existing_id = find_by_content_hash(cursor, content_hash)
+                if existing_id:
+                    dedup_source = 'content_hash'
+
+            if not existing_id:
+                resume_id = str(uuid.uuid4())
+                existing_id = insert_or_find(
+                    cursor,
+                    """
+                    INSERT INTO resumes (
+                        id, user_email, full_name, phone, social_links,
+                        profile_summary, education, technical_skills,
+                        work_experience, projects, languages, certifications,
+                        content_hash
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        resume_id,
+                        sanitized_data['user_email'],
+                        sanitized_data['full_name'],
+                        sanitized_data.get('phone'),
+                        json.dumps(sanitized_data.get('social_links', {})),
+                        sanitized_data.get('profile_summary'),
+                        json.dumps(sanitized_data.get('education', [])),
+                        json.dumps(sanitized_data.get('technical_skills', {})),
+                        json.dumps(sanitized_data.get('work_experience', [])),
+                        json.dumps(sanitized_data.get('projects', [])),
+                        json.dumps(sanitized_data.get('languages', [])),
+                        json.dumps(sanitized_data.get('certifications', [])),
+                        content_hash
+                    ),
+                    content_hash
                 )
-            )
+                if existing_id:
+                    dedup_source = 'content_hash'
+
+            if dedup_source:
+                resume_id = existing_id
+                record_dedup_hit(cursor, dedup_source)
+            else:
+                record_resume_added(cursor, resume_id, sanitized_data['user_email'], sanitized_data.get('technical_skills', {}))
+
+            if idempotency_key and dedup_source != 'idempotency_key':
+                record_idempotency_key(cursor, idempotency_key, resume_id, content_hash)
+
+        if dedup_source:
+            return jsonify({
+                'message': 'Resume already submitted',
+                'resume_id': resume_id,
+                'duplicate': True
+            }), 200
 
         return jsonify({
             'message': 'Resume submitted successfully',
@@ -114,6 +264,29 @@ def submit_resume():
         app.logger.error(f"Error submitting resume: {str(e)}")
         return jsonify({'error': 'Failed to submit resume'}), 500
 
+@app.route('/api/admin/stats', methods=['GET'])
+@require_admin_auth
+def dashboard_stats():
+    try:
+        days = min(max(int(request.args.get('days', 30)), 1), 366)
+        top = min(max(int(request.args.get('top', 10)), 1), 100)
+
+        return jsonify(get_dashboard_stats(days, top)), 200
+
+    except Exception as e:
+        app.logger.error(f"Error fetching stats: {str(e)}")
+        return jsonify({'error': 'Failed to fetch stats'}), 500
+
+@app.route('/api/admin/stats/dedup', methods=['GET'])
+@require_admin_auth
+def dedup_stats():
+    try:
+        return jsonify(get_dedup_stats()), 200
+
+    except Exception as e:
+        app.logger.error(f"Error fetching dedup stats: {str(e)}")
+        return jsonify({'error': 'Failed to fetch dedup stats'}), 500
+
 @app.route('/api/admin/resumes', methods=['GET'])
 @require_admin_auth
 def get_all_resumes():
@@ -122,7 +295,7 @@ def get_all_resumes():
         per_page = min(int(request.args.get('per_page', 20)), 100)
         offset = (page - 1) * per_page
 
-        with get_db_cursor() as cursor:
+        with get_db_cursor(readonly=True) as cursor:
             cursor.execute(
                 """
                 SELECT id, user_email, full_name, phone, created_at, updated_at
@@ -159,33 +332,13 @@ def get_all_resumes():
 @require_admin_auth
 def get_resume_by_id(resume_id):
     try:
-        with get_db_cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT id, user_email, full_name, phone, social_links,
-                       profile_summary, education, technical_skills,
-                       work_experience, projects, languages, certifications,
-                       created_at, updated_at
-                FROM resumes
-                WHERE id = %s
-                """,
-                (resume_id,)
-            )
-            resume = cursor.fetchone()
+        resume = fetch_resume(resume_id)
 
         if not resume:
             return jsonify({'error': 'Resume not found'}), 404
 
-        for field in ['social_links', 'education', 'technical_skills', 'work_experience', 'projects', 'languages', 'certifications']:
-            if resume.get(field):
-                resume[field] = json.loads(resume[field])
-
-        if resume.get('created_at'):
-            resume['created_at'] = resume['created_at'].isoformat()
-        if resume.get('updated_at'):
-            resume['updated_at'] = resume['updated_at'].isoformat()
-
-        return jsonify(resume), 200
+        # Sections are passed through as stored, without a decode/encode round trip
+        return app.response_class(resume.to_json(), mimetype='application/json'), 200
 
     except Exception as e:
         app.logger.error(f"Error fetching resume: {str(e)}")
@@ -194,95 +347,75 @@ def get_resume_by_id(resume_id):
 @app.route('/api/admin/resumes/<resume_id>/pdf', methods=['GET'])
 @require_admin_auth
 def download_resume_pdf(resume_id):
+    return download_resume(resume_id)
+
+@app.route('/api/admin/resumes/<resume_id>', methods=['DELETE'])
+@require_admin_auth
+def delete_resume(resume_id):
     try:
-        with get_db_cursor() as cursor:
+        with get_db_cursor(commit=True) as cursor:
             cursor.execute(
-                """
-                SELECT user_email, full_name, phone, social_links,
-                       profile_summary, education, technical_skills,
-                       work_experience, projects, languages, certifications
-                FROM resumes
-                WHERE id = %s
-                """,
+                "SELECT id, created_at, user_email, technical_skills FROM resumes WHERE id = %s FOR UPDATE",
                 (resume_id,)
             )
             resume = cursor.fetchone()
 
-        if not resume:
-            return jsonify({'error': 'Resume not found'}), 404
-
-        for field in ['social_links', 'education', 'technical_skills', 'work_experience', 'projects', 'languages', 'certifications']:
-            if resume.get(field):
-                resume[field] = json.loads(resume[field])
+            if not resume:
+                return jsonify({'error': 'Resume not found'}), 404
 
-        pdf_buffer = generate_resume_pdf(resume)
+            delete_resume_rows(cursor, [resume])
 
-        filename = f"{resume['full_name'].replace(' ', '_')}_resume.pdf"
+        invalidate_cached_files([resume_id])
 
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        return jsonify({'message': 'Resume deleted successfully'}), 200
 
     except Exception as e:
-        app.logger.error(f"Error generating PDF: {str(e)}")
-        return jsonify({'error': 'Failed to generate PDF'}), 500
+        app.logger.error(f"Error deleting resume: {str(e)}")
+        return jsonify({'error': 'Failed to delete resume'}), 500
 
-@app.route('/api/admin/resumes/<resume_id>', methods=['DELETE'])
+@app.route('/api/admin/resumes/bulk-delete', methods=['POST'])
 @require_admin_auth
-def delete_resume(resume_id):
-    try:
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute("DELETE FROM resumes WHERE id = %s", (resume_id,))
-
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'Resume not found'}), 404
+def bulk_delete_resumes():
+    data = request.get_json(silent=True)
 
-        return jsonify({'message': 'Resume deleted successfully'}), 200
+    if not data or not isinstance(data, dict):
+        return jsonify({'error': 'No data provided'}), 400
 
-    except Exception as e:
-        app.logger.error(f"Error deleting resume: {str(e)}")
-        return jsonify({'error': 'Failed to delete resume'}), 500
+    criteria, error = parse_bulk_delete_criteria(data)
+    if error:
+        return jsonify({'error': error}), 400
 
-@app.route('/api/resumes/<resume_id>/pdf', methods=['GET'])
-def public_download_pdf(resume_id):
     try:
-        with get_db_cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT user_email, full_name, phone, social_links,
-                       profile_summary, education, technical_skills,
-                       work_experience, projects, languages, certifications
-                FROM resumes
-                WHERE id = %s
-                """,
-                (resume_id,)
-            )
-            resume = cursor.fetchone()
+        job_id = start_bulk_delete(request.admin_id, criteria)
 
-        if not resume:
-            return jsonify({'error': 'Resume not found'}), 404
+        return jsonify({
+            'message': 'Bulk delete started',
+            'job_id': job_id,
+            'status': 'pending'
+        }), 202
 
-        for field in ['social_links', 'education', 'technical_skills', 'work_experience', 'projects', 'languages', 'certifications']:
-            if resume.get(field):
-                resume[field] = json.loads(resume[field])
+    except Exception as e:
+        app.logger.error(f"Error starting bulk delete: {str(e)}")
+        return jsonify({'error': 'Failed to start bulk delete'}), 500
 
-        pdf_buffer = generate_resume_pdf(resume)
+@app.route('/api/admin/resumes/bulk-delete/<job_id>', methods=['GET'])
+@require_admin_auth
+def bulk_delete_status(job_id):
+    try:
+        job = get_bulk_delete_job(job_id)
 
-        filename = f"{resume['full_name'].replace(' ', '_')}_resume.pdf"
+        if not job:
+            return jsonify({'error': 'Bulk delete job not found'}), 404
 
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        return jsonify(job), 200
 
     except Exception as e:
-        app.logger.error(f"Error generating PDF: {str(e)}")
-        return jsonify({'error': 'Failed to generate PDF'}), 500
+        app.logger.error(f"Error fetching bulk delete job: {str(e)}")
+        return jsonify({'error': 'Failed to fetch bulk delete job'}), 500
+
+@app.route('/api/resumes/<resume_id>/pdf', methods=['GET'])
+def public_download_pdf(resume_id):
+    return download_resume(resume_id)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -296,6 +429,7 @@ if __name__ == '__main__':
     try:
         init_db()
         clean_expired_sessions()
+        clean_expired_idempotency_keys()
         app.run(host='0.0.0.0', port=5000, debug=False)
     except Exception as e:
         print(f"Failed to start application: {str(e)}")
@@ -57,8 +57,8 @@ def login_admin(email, password):
 
         return session_token, None
 
-def verify_session(session_token):
-    with get_db_cursor(commit=True) as cursor:
+def _fetch_session(session_token, readonly):
+    with get_db_cursor(readonly=readonly) as cursor:
         cursor.execute(
             """
             SELECT s.admin_id, s.expires_at, a.email
@@ -68,16 +68,21 @@ def verify_session(session_token):
             """,
             (session_token,)
         )
-        session = cursor.fetchone()
+        return cursor.fetchone()
 
-        if not session:
-            return None
+def verify_session(session_token):
+    # Right after login or logout the client's write token routes this read to the primary
+    session = _fetch_session(session_token, readonly=True)
+
+    if not session:
+        return None
 
-        if datetime.fromisoformat(str(session['expires_at'])) < datetime.utcnow():
+    if datetime.fromisoformat(str(session['expires_at'])) < datetime.utcnow():
+        with get_db_cursor(commit=True) as cursor:
             cursor.execute("DELETE FROM admin_sessions WHERE session_token = %s", (session_token,))
-            return None
+        return None
 
-        return session
+    return session
 
 def logout_admin(session_token):
     with get_db_cursor(commit=True) as cursor:
@@ -0,0 +1,258 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from database import get_db_cursor
+from auth import clean_expired_sessions
+from dedup import clean_expired_idempotency_keys
+from stats import record_resumes_removed
+from pdf_cache import invalidate_cached_files, prune_cache
+from config import Config
+
+MAX_BULK_DELETE_IDS = 10000
+
+class JobInterrupted(Exception):
+    pass
+
+logger = logging.getLogger(__name__)
+
+_maintenance_lock = threading.Lock()
+_last_maintenance_at = None
+
+MAINTENANCE_TASKS = [clean_expired_sessions, clean_expired_idempotency_keys, prune_cache]
+
+def run_maintenance():
+    for task in MAINTENANCE_TASKS:
+        try:
+            task()
+        except Exception:
+            logger.exception(f"Maintenance task {task.__name__} failed")
+
+def maybe_run_maintenance():
+    global _last_maintenance_at
+
+    # Each worker runs the housekeeping at most once per interval, off the request thread
+    now = time.monotonic()
+    with _maintenance_lock:
+        if _last_maintenance_at is not None and now - _last_maintenance_at < Config.MAINTENANCE_INTERVAL_SECONDS:
+            return
+        _last_maintenance_at = now
+
+    threading.Thread(target=run_maintenance, daemon=True).start()
+
+def parse_bulk_delete_criteria(data):
+    ids = data.get('ids')
+    filters = data.get('filter')
+
+    if ids is not None and filters is not None:
+        return None, 'Provide either ids or filter, not both'
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) for i in ids):
+            return None, 'ids must be a non-empty list of resume ids'
+        if len(ids) > MAX_BULK_DELETE_IDS:
+            return None, f'At most {MAX_BULK_DELETE_IDS} ids can be deleted per request'
+        return {'ids': sorted(set(ids))}, None
+
+    if not isinstance(filters, dict):
+        return None, 'Provide a non-empty ids list or a filter'
+
+    criteria = {}
+    for key in ('created_from', 'created_before'):
+        if filters.get(key):
+            try:
+                datetime.fromisoformat(str(filters[key]))
+            except ValueError:
+                return None, f'Invalid {key} date'
+            criteria[key] = str(filters[key])
+
+    domain = str(filters.get('email_domain') or '').strip().lower().lstrip('@')
+    if domain:
+        criteria['email_domain'] = domain
+
+    if not criteria:
+        return None, 'filter needs at least one of created_from, created_before or email_domain'
+
+    return criteria, None
+
+def delete_resume_rows(cursor, rows):
+    ids = [row['id'] for row in rows]
+    placeholders = ', '.join(['%s'] * len(ids))
+
+    cursor.execute(f"DELETE FROM resumes WHERE id IN ({placeholders})", ids)
+    cursor.execute(f"DELETE FROM idempotency_keys WHERE resume_id IN ({placeholders})", ids)
+    record_resumes_removed(cursor, rows)
+
+def _window_end(after_id):
+    # Primary-key-only lookup of where the next fixed-size scan window ends
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM resumes WHERE id > %s ORDER BY id LIMIT 1 OFFSET %s",
+            (after_id, Config.BULK_DELETE_SCAN_WINDOW - 1)
+        )
+        row = cursor.fetchone()
+    return row['id'] if row else None
+
+def _scan_window(criteria, after_id, window_end):
+    clauses = ['id > %s']
+    params = [after_id]
+
+    if window_end is not None:
+        clauses.append('id <= %s')
+        params.append(window_end)
+    if criteria.get('created_from'):
+        clauses.append('created_at >= %s')
+        params.append(criteria['created_from'])
+    if criteria.get('created_before'):
+        clauses.append('created_at < %s')
+        params.append(criteria['created_before'])
+    if criteria.get('email_domain'):
+        escaped = criteria['email_domain'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        clauses.append('user_email LIKE %s')
+        params.append(f'%@{escaped}')
+
+    # Plain read: only the rows of the chunk being deleted get locked, not everything scanned
+    with get_db_cursor() as cursor:
+        cursor.execute(f"SELECT id FROM resumes WHERE {' AND '.join(clauses)} ORDER BY id", params)
+        return [row['id'] for row in cursor.fetchall()]
+
+def _record_scan_progress(job_id, scanned_through):
+    # Heartbeat between scan windows, so a sparse filter is not mistaken for a dead job
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "UPDATE bulk_delete_jobs SET scanned_through = %s WHERE id = %s AND status = 'running'",
+            (scanned_through, job_id)
+        )
+        if cursor.rowcount == 0:
+            raise JobInterrupted(job_id)
+
+def _delete_chunk(job_id, ids):
+    placeholders = ', '.join(['%s'] * len(ids))
+
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            f"""
+            SELECT id, created_at, user_email, technical_skills
+            FROM resumes
+            WHERE id IN ({placeholders})
+            FOR UPDATE
+            """,
+            ids
+        )
+        rows = cursor.fetchall()
+
+        if rows:
+            delete_resume_rows(cursor, rows)
+
+        # Also the job's heartbeat: bumping chunks refreshes updated_at
+        cursor.execute(
+            """
+            UPDATE bulk_delete_jobs
+            SET deleted = deleted + %s, chunks = chunks + 1
+            WHERE id = %s AND status = 'running'
+            """,
+            (len(rows), job_id)
+        )
+
+        # Rolls this chunk back if the job was already reported as interrupted
+        if cursor.rowcount == 0:
+            raise JobInterrupted(job_id)
+
+    # Only after the commit: a download racing the delete could otherwise re-cache the PDF
+    invalidate_cached_files([row['id'] for row in rows])
+
+def _set_job_status(job_id, status, error=None, from_status='running'):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "UPDATE bulk_delete_jobs SET status = %s, error = %s WHERE id = %s AND status = %s",
+            (status, error, job_id, from_status)
+        )
+        return cursor.rowcount > 0
+
+def run_bulk_delete(job_id, criteria):
+    chunk_size = Config.BULK_DELETE_CHUNK_SIZE
+
+    try:
+        if not _set_job_status(job_id, 'running', from_status='pending'):
+            return
+
+        if 'ids' in criteria:
+            ids = criteria['ids']
+            for start in range(0, len(ids), chunk_size):
+                _delete_chunk(job_id, ids[start:start + chunk_size])
+        else:
+            after_id = ''
+            while True:
+                window_end = _window_end(after_id)
+                ids = _scan_window(criteria, after_id, window_end)
+                for start in range(0, len(ids), chunk_size):
+                    _delete_chunk(job_id, ids[start:start + chunk_size])
+                if window_end is None:
+                    break
+                _record_scan_progress(job_id, window_end)
+                after_id = window_end
+
+        _set_job_status(job_id, 'completed')
+
+    except JobInterrupted:
+        logger.warning(f"Bulk delete job {job_id} was marked interrupted; stopping")
+
+    except Exception as e:
+        logger.exception(f"Bulk delete job {job_id} failed")
+        try:
+            _set_job_status(job_id, 'failed', str(e))
+        except Exception:
+            logger.exception(f"Could not record failure of bulk delete job {job_id}")
+
+def start_bulk_delete(admin_id, criteria):
+    job_id = str(uuid.uuid4())
+
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """
+            INSERT INTO bulk_delete_jobs (id, admin_id, criteria, requested, status)
+            VALUES (%s, %s, %s, %s, 'pending')
+            """,
+            (job_id, admin_id, json.dumps(criteria), len(criteria['ids']) if 'ids' in criteria else None)
+        )
+
+    threading.Thread(target=run_bulk_delete, args=(job_id, criteria), daemon=True).start()
+
+    return job_id
+
+def get_bulk_delete_job(job_id):
+    with get_db_cursor(commit=True) as cursor:
+        # A job whose heartbeat stopped lost its worker; report it instead of leaving it running forever
+        cursor.execute(
+            """
+            UPDATE bulk_delete_jobs
+            SET status = 'interrupted', error = 'The worker running this job stopped before it finished'
+            WHERE id = %s AND status IN ('pending', 'running')
+              AND updated_at < DATE_SUB(NOW(), INTERVAL %s SECOND)
+            """,
+            (job_id, Config.BULK_DELETE_STALE_SECONDS)
+        )
+
+        cursor.execute(
+            """
+            SELECT id, admin_id, criteria, requested, deleted, chunks, status, error,
+                   created_at, updated_at
+            FROM bulk_delete_jobs
+            WHERE id = %s
+            """,
+            (job_id,)
+        )
+        job = cursor.fetchone()
+
+    if not job:
+        return None
+
+    job['criteria'] = json.loads(job['criteria'])
+    if job.get('created_at'):
+        job['created_at'] = job['created_at'].isoformat()
+    if job.get('updated_at'):
+        job['updated_at'] = job['updated_at'].isoformat()
+
+    return job
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,10 +13,48 @@ class Config:
     MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', '')
     MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'resume_builder')
 
+    # Comma-separated host[:port] list of read replicas; empty sends all reads to MYSQL_HOST
+    MYSQL_REPLICA_HOSTS = [h.strip() for h in os.environ.get('MYSQL_REPLICA_HOSTS', '').split(',') if h.strip()]
+    REPLICA_MAX_LAG_SECONDS = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_LAG_CHECK_SECONDS = int(os.environ.get('REPLICA_LAG_CHECK_SECONDS', 10))
+    REPLICA_RETRY_SECONDS = int(os.environ.get('REPLICA_RETRY_SECONDS', 30))
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))
+
     SESSION_EXPIRY_HOURS = int(os.environ.get('SESSION_EXPIRY_HOURS', 24))
 
     MAX_RESUME_SIZE = 50000
 
+    # Render cost budgets checked at submission
+    MAX_SECTION_ITEMS = int(os.environ.get('MAX_SECTION_ITEMS', 30))
+    MAX_SKILLS = int(os.environ.get('MAX_SKILLS', 150))
+    MAX_FIELD_LENGTH = int(os.environ.get('MAX_FIELD_LENGTH', 5000))
+    MAX_TEXT_LENGTH = int(os.environ.get('MAX_TEXT_LENGTH', 30000))
+    MAX_ESTIMATED_PAGES = int(os.environ.get('MAX_ESTIMATED_PAGES', 8))
+
+    # Hard limits enforced by the PDF renderer itself
+    MAX_RENDER_PAGES = int(os.environ.get('MAX_RENDER_PAGES', 15))
+    MAX_RENDER_SECONDS = float(os.environ.get('MAX_RENDER_SECONDS', 10))
+
+    LATEX_COMMAND = os.environ.get('LATEX_COMMAND', 'pdflatex')
+    LATEX_WORKERS = int(os.environ.get('LATEX_WORKERS', 2))
+    LATEX_TIMEOUT_SECONDS = float(os.environ.get('LATEX_TIMEOUT_SECONDS', 20))
+    LATEX_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('LATEX_QUEUE_TIMEOUT_SECONDS', 10))
+
+    PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'resume-pdf-cache')
+    PDF_CACHE_MAX_AGE_HOURS = int(os.environ.get('PDF_CACHE_MAX_AGE_HOURS', 168))
+    PDF_CACHE_MAX_MB = int(os.environ.get('PDF_CACHE_MAX_MB', 512))
+    # Internal nginx location mapped to PDF_CACHE_DIR; when set, nginx serves cached files
+    PDF_ACCEL_REDIRECT_PREFIX = os.environ.get('PDF_ACCEL_REDIRECT_PREFIX', '')
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'
+
+    IDEMPOTENCY_WINDOW_HOURS = int(os.environ.get('IDEMPOTENCY_WINDOW_HOURS', 24))
+
+    MAINTENANCE_INTERVAL_SECONDS = int(os.environ.get('MAINTENANCE_INTERVAL_SECONDS', 600))
+
+    BULK_DELETE_CHUNK_SIZE = int(os.environ.get('BULK_DELETE_CHUNK_SIZE', 500))
+    BULK_DELETE_SCAN_WINDOW = int(os.environ.get('BULK_DELETE_SCAN_WINDOW', 10000))
+    BULK_DELETE_STALE_SECONDS = int(os.environ.get('BULK_DELETE_STALE_SECONDS', 120))
+
     BCRYPT_LOG_ROUNDS = 12
 
     ALLOWED_ORIGINS = os.environ.get('ALLOWED_ORIGINS', 'http://localhost:5173,http://localhost:3000').split(',')
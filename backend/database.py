@@ -1,12 +1,52 @@
+import hashlib
+import hmac
+import itertools
+import threading
+import time
 import pymysql
 from pymysql.cursors import DictCursor
 from contextlib import contextmanager
 from config import Config
 
-def get_connection():
+_replica_lock = threading.Lock()
+_replica_rotation = itertools.count()
+_replica_down_until = {}
+_replica_lag_checked_at = {}
+
+# Read-your-writes state for the request being handled on this thread
+_request_state = threading.local()
+
+def begin_request(last_write_at=None):
+    _request_state.last_write_at = last_write_at or 0.0
+    _request_state.wrote = False
+
+def _sign_write_time(value):
+    return hmac.new(Config.SECRET_KEY.encode('utf-8'), value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+def issue_write_token():
+    if not getattr(_request_state, 'wrote', False):
+        return None
+    value = f"{_request_state.last_write_at:.3f}"
+    return f"{value}.{_sign_write_time(value)}"
+
+def parse_write_token(token):
+    # Only tokens this server issued count, so clients cannot pin their reads to the primary
+    value, _, signature = (token or '').rpartition('.')
+    if not value or not hmac.compare_digest(_sign_write_time(value), signature):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def _parse_host(spec):
+    host, _, port = spec.partition(':')
+    return host, int(port) if port else Config.MYSQL_PORT
+
+def get_connection(host=None, port=None):
     return pymysql.connect(
-        host=Config.MYSQL_HOST,
-        port=Config.MYSQL_PORT,
+        host=host or Config.MYSQL_HOST,
+        port=port or Config.MYSQL_PORT,
         user=Config.MYSQL_USER,
         password=Config.MYSQL_PASSWORD,
         database=Config.MYSQL_DATABASE,
@@ -14,14 +54,78 @@ def get_connection():
         autocommit=False
     )
 
+def _mark_replica_down(spec):
+    with _replica_lock:
+        _replica_down_until[spec] = time.monotonic() + Config.REPLICA_RETRY_SECONDS
+        _replica_lag_checked_at.pop(spec, None)
+
+def _replica_lag_ok(spec, connection):
+    now = time.monotonic()
+    with _replica_lock:
+        checked_at = _replica_lag_checked_at.get(spec)
+    if checked_at is not None and now - checked_at < Config.REPLICA_LAG_CHECK_SECONDS:
+        return True
+
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW REPLICA STATUS")
+        status = cursor.fetchone()
+
+    # No status row means the host is not replicating; NULL lag means the SQL thread is stopped
+    lag = None
+    if status:
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+    if lag is None or lag > Config.REPLICA_MAX_LAG_SECONDS:
+        return False
+
+    with _replica_lock:
+        _replica_lag_checked_at[spec] = now
+    return True
+
+def _get_replica_connection():
+    replicas = Config.MYSQL_REPLICA_HOSTS
+    if not replicas:
+        return None
+
+    # Reads shortly after this client's last write go to the primary so they see it
+    if time.time() - getattr(_request_state, 'last_write_at', 0.0) < Config.READ_YOUR_WRITES_SECONDS:
+        return None
+
+    start = next(_replica_rotation)
+    for i in range(len(replicas)):
+        spec = replicas[(start + i) % len(replicas)]
+        with _replica_lock:
+            if _replica_down_until.get(spec, 0) > time.monotonic():
+                continue
+
+        connection = None
+        try:
+            connection = get_connection(*_parse_host(spec))
+            if _replica_lag_ok(spec, connection):
+                return connection
+        except pymysql.MySQLError:
+            pass
+
+        if connection is not None:
+            connection.close()
+        _mark_replica_down(spec)
+
+    return None
+
 @contextmanager
-def get_db_cursor(commit=False):
-    connection = get_connection()
+def get_db_cursor(commit=False, readonly=False):
+    connection = None
+    if readonly:
+        connection = _get_replica_connection()
+    if connection is None:
+        connection = get_connection()
+
     cursor = connection.cursor()
     try:
         yield cursor
-        if commit:
+        if commit and not readonly:
             connection.commit()
+            _request_state.last_write_at = time.time()
+            _request_state.wrote = True
     except Exception as e:
         connection.rollback()
         raise e
@@ -29,6 +133,40 @@ def get_db_cursor(commit=False):
         cursor.close()
         connection.close()
 
+def _ensure_column(cursor, table, column, alter_clause):
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS total FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (Config.MYSQL_DATABASE, table, column)
+    )
+    if not cursor.fetchone()['total']:
+        cursor.execute(f"ALTER TABLE {table} {alter_clause}")
+
+def _ensure_index(cursor, table, index, alter_clause):
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS total FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """,
+        (Config.MYSQL_DATABASE, table, index)
+    )
+    if not cursor.fetchone()['total']:
+        cursor.execute(f"ALTER TABLE {table} {alter_clause}")
+
+def _ensure_collation(cursor, table, column, definition, collation):
+    cursor.execute(
+        """
+        SELECT COLLATION_NAME AS collation_name FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (Config.MYSQL_DATABASE, table, column)
+    )
+    row = cursor.fetchone()
+    if row and row['collation_name'] != collation:
+        cursor.execute(f"ALTER TABLE {table} MODIFY {column} {definition} COLLATE {collation}")
+
 def init_db():
     connection = pymysql.connect(
         host=Config.MYSQL_HOST,
@@ -68,13 +206,21 @@ def init_db():
             projects JSON,
             languages JSON,
             certifications JSON,
+            content_hash CHAR(64) NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             INDEX idx_created (created_at DESC),
-            INDEX idx_email (user_email)
+            INDEX idx_email (user_email),
+            UNIQUE INDEX idx_content_hash (content_hash)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
     """)
 
+    _ensure_column(
+        cursor, 'resumes', 'content_hash',
+        "ADD COLUMN content_hash CHAR(64) NULL AFTER certifications, "
+        "ADD UNIQUE INDEX idx_content_hash (content_hash)"
+    )
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS admin_sessions (
             id VARCHAR(36) PRIMARY KEY,
@@ -88,6 +234,75 @@ def init_db():
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
     """)
 
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            idempotency_key VARCHAR(255) PRIMARY KEY,
+            resume_id VARCHAR(36) NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_created (created_at),
+            INDEX idx_resume (resume_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Deletes look keys up by resume_id; without an index they lock the whole table
+    _ensure_index(cursor, 'idempotency_keys', 'idx_resume', "ADD INDEX idx_resume (resume_id)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS submission_counters (
+            name VARCHAR(64) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS resume_daily_counts (
+            day DATE PRIMARY KEY,
+            total INT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS resume_skill_counts (
+            skill VARCHAR(255) COLLATE utf8mb4_bin PRIMARY KEY,
+            total INT NOT NULL DEFAULT 0,
+            INDEX idx_total (total DESC)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS resume_domain_counts (
+            domain VARCHAR(255) COLLATE utf8mb4_bin PRIMARY KEY,
+            total INT NOT NULL DEFAULT 0,
+            INDEX idx_total (total DESC)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # Rollup keys must compare exactly like the Python dict keys they come from
+    _ensure_collation(cursor, 'resume_skill_counts', 'skill', 'VARCHAR(255) NOT NULL', 'utf8mb4_bin')
+    _ensure_collation(cursor, 'resume_domain_counts', 'domain', 'VARCHAR(255) NOT NULL', 'utf8mb4_bin')
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bulk_delete_jobs (
+            id VARCHAR(36) PRIMARY KEY,
+            admin_id VARCHAR(36) NOT NULL,
+            criteria JSON NOT NULL,
+            requested INT NULL,
+            deleted INT NOT NULL DEFAULT 0,
+            chunks INT NOT NULL DEFAULT 0,
+            scanned_through VARCHAR(36) NULL,
+            status VARCHAR(20) NOT NULL,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    _ensure_column(
+        cursor, 'bulk_delete_jobs', 'scanned_through',
+        "ADD COLUMN scanned_through VARCHAR(36) NULL AFTER chunks"
+    )
+
     connection.commit()
     cursor.close()
     connection.close()
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import pymysql
+from database import get_db_cursor
+from config import Config
+
+def compute_content_hash(sanitized_data):
+    canonical = dict(sanitized_data)
+    canonical['user_email'] = (canonical.get('user_email') or '').strip().lower()
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def find_by_idempotency_key(cursor, idempotency_key):
+    cursor.execute(
+        """
+        SELECT resume_id, content_hash
+        FROM idempotency_keys
+        WHERE idempotency_key = %s
+          AND created_at > DATE_SUB(NOW(), INTERVAL %s HOUR)
+        """,
+        (idempotency_key, Config.IDEMPOTENCY_WINDOW_HOURS)
+    )
+    return cursor.fetchone()
+
+def find_by_content_hash(cursor, content_hash):
+    cursor.execute("SELECT id FROM resumes WHERE content_hash = %s", (content_hash,))
+    row = cursor.fetchone()
+    return row['id'] if row else None
+
+def insert_or_find(cursor, insert_sql, params, content_hash):
+    # Two identical submissions racing past find_by_content_hash collide on the unique index
+    try:
+        cursor.execute(insert_sql, params)
+        return None
+    except pymysql.err.IntegrityError:
+        # Locking read: a plain SELECT would reuse this transaction's snapshot and miss the other row
+        cursor.execute("SELECT id FROM resumes WHERE content_hash = %s LOCK IN SHARE MODE", (content_hash,))
+        row = cursor.fetchone()
+        if not row:
+            raise
+        return row['id']
+
+def record_idempotency_key(cursor, idempotency_key, resume_id, content_hash):
+    cursor.execute(
+        """
+        INSERT INTO idempotency_keys (idempotency_key, resume_id, content_hash)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            resume_id = VALUES(resume_id),
+            content_hash = VALUES(content_hash),
+            created_at = CURRENT_TIMESTAMP
+        """,
+        (idempotency_key, resume_id, content_hash)
+    )
+
+def record_dedup_hit(cursor, source):
+    cursor.execute(
+        """
+        INSERT INTO submission_counters (name, value) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE value = value + 1
+        """,
+        (f'dedup_{source}',)
+    )
+
+def get_dedup_stats():
+    with get_db_cursor(readonly=True) as cursor:
+        cursor.execute(
+            "SELECT name, value FROM submission_counters WHERE name IN (%s, %s)",
+            ('dedup_idempotency_key', 'dedup_content_hash')
+        )
+        counters = {row['name']: int(row['value']) for row in cursor.fetchall()}
+
+        cursor.execute(
+            "SELECT COUNT(*) AS total FROM idempotency_keys WHERE created_at > DATE_SUB(NOW(), INTERVAL %s HOUR)",
+            (Config.IDEMPOTENCY_WINDOW_HOURS,)
+        )
+        active_keys = cursor.fetchone()['total']
+
+    idempotency_hits = counters.get('dedup_idempotency_key', 0)
+    content_hash_hits = counters.get('dedup_content_hash', 0)
+
+    return {
+        'idempotency_key_hits': idempotency_hits,
+        'content_hash_hits': content_hash_hits,
+        'total_duplicates': idempotency_hits + content_hash_hits,
+        'tracked_idempotency_keys': active_keys,
+        'idempotency_window_hours': Config.IDEMPOTENCY_WINDOW_HOURS
+    }
+
+def clean_expired_idempotency_keys():
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "DELETE FROM idempotency_keys WHERE created_at < DATE_SUB(NOW(), INTERVAL %s HOUR)",
+            (Config.IDEMPOTENCY_WINDOW_HOURS,)
+        )
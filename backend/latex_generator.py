@@ -0,0 +1,324 @@
+import html
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from config import Config
+from pdf_generator import RenderLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+_FIELD = re.compile(r'<<(!?)(\w+)>>')
+
+_LATEX_ESCAPES = str.maketrans({
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '<': r'\textless{}',
+    '>': r'\textgreater{}',
+})
+
+class LatexCompileError(Exception):
+    pass
+
+class LatexPoolBusy(Exception):
+    pass
+
+def escape_latex(text):
+    # Stored text went through bleach, which HTML-escapes &, < and >
+    return html.unescape(str(text)).translate(_LATEX_ESCAPES)
+
+def compile_template(source):
+    parts = []
+    position = 0
+    for match in _FIELD.finditer(source):
+        if match.start() > position:
+            parts.append((None, source[position:match.start()]))
+        parts.append((match.group(1) == '!', match.group(2)))
+        position = match.end()
+    if position < len(source):
+        parts.append((None, source[position:]))
+    return tuple(parts)
+
+def render_template(template, **values):
+    for raw, part in template:
+        if raw is None:
+            yield part
+        elif raw:
+            yield values[part]
+        else:
+            yield escape_latex(values[part])
+
+TEMPLATE_SOURCES = {
+    'preamble': '\n'.join([
+        r'\documentclass[10pt,letterpaper]{article}',
+        r'\usepackage[utf8]{inputenc}',
+        r'\usepackage[T1]{fontenc}',
+        r'\usepackage[margin=0.75in]{geometry}',
+        r'\usepackage{helvet}',
+        r'\renewcommand{\familydefault}{\sfdefault}',
+        r'\pagestyle{empty}',
+        r'\setlength{\parindent}{0pt}',
+        r'\newcommand{\resumesection}[1]{\vspace{10pt}{\large\bfseries #1}\par\vspace{2pt}\hrule\vspace{6pt}}',
+        r'\begin{document}',
+        '',
+    ]),
+    'header': '\\begin{center}\n{\\LARGE\\bfseries <<full_name>>}\\par\\vspace{4pt}\n<<!contact>>\n\\end{center}\n',
+    'section': '\\resumesection{<<title>>}\n',
+    'entry': '\\textbf{<<title>>}<<!details>>\\par\\vspace{2pt}\n',
+    'paragraph': '<<text>>\\par\\vspace{4pt}\n',
+    'end': '\\end{document}\n',
+}
+
+TEMPLATES = {name: compile_template(source) for name, source in TEMPLATE_SOURCES.items()}
+
+# Everything before \begin{document} is identical for every resume, so it can be dumped into a format file once
+FORMAT_PREAMBLE = TEMPLATE_SOURCES['preamble'][:TEMPLATE_SOURCES['preamble'].index(r'\begin{document}')]
+
+def _details(*pairs):
+    return ''.join(separator + escape_latex(value) for separator, value in pairs if value)
+
+def generate_resume_tex(resume_data):
+    yield from render_template(TEMPLATES['preamble'])
+
+    contact_info = []
+    if resume_data.get('phone'):
+        contact_info.append(escape_latex(resume_data['phone']))
+    if resume_data.get('user_email'):
+        contact_info.append(escape_latex(resume_data['user_email']))
+    for platform, url in (resume_data.get('social_links') or {}).items():
+        if url:
+            contact_info.append(escape_latex(f"{platform}: {url}"))
+
+    yield from render_template(
+        TEMPLATES['header'],
+        full_name=resume_data.get('full_name', ''),
+        contact=r' \textbar{} '.join(contact_info)
+    )
+
+    if resume_data.get('profile_summary'):
+        yield from render_template(TEMPLATES['section'], title='PROFESSIONAL SUMMARY')
+        yield from render_template(TEMPLATES['paragraph'], text=resume_data['profile_summary'])
+
+    education = resume_data.get('education') or []
+    if education:
+        yield from render_template(TEMPLATES['section'], title='EDUCATION')
+        for edu in education:
+            if isinstance(edu, dict):
+                details = _details((' -- ', edu.get('institution')), (' \\textbar{} ', edu.get('year')))
+                if edu.get('gpa'):
+                    details += ' \\textbar{} GPA: ' + escape_latex(edu['gpa'])
+                yield from render_template(TEMPLATES['entry'], title=edu.get('degree', ''), details=details)
+
+    technical_skills = resume_data.get('technical_skills') or {}
+    if technical_skills:
+        yield from render_template(TEMPLATES['section'], title='TECHNICAL SKILLS')
+        for category, skills in technical_skills.items():
+            skills_text = ', '.join(skills) if isinstance(skills, list) else str(skills)
+            yield from render_template(TEMPLATES['entry'], title=f"{category}:", details=_details((' ', skills_text)))
+
+    work_experience = resume_data.get('work_experience') or []
+    if work_experience:
+        yield from render_template(TEMPLATES['section'], title='WORK EXPERIENCE')
+        for work in work_experience:
+            if isinstance(work, dict):
+                details = _details((' -- ', work.get('company')), (' \\textbar{} ', work.get('period')))
+                yield from render_template(TEMPLATES['entry'], title=work.get('title', ''), details=details)
+                if work.get('description'):
+                    yield from render_template(TEMPLATES['paragraph'], text=work['description'])
+
+    projects = resume_data.get('projects') or []
+    if projects:
+        yield from render_template(TEMPLATES['section'], title='PROJECTS')
+        for project in projects:
+            if isinstance(project, dict):
+                details = _details((' \\textbar{} ', project.get('technologies')))
+                yield from render_template(TEMPLATES['entry'], title=project.get('name', ''), details=details)
+                if project.get('description'):
+                    yield from render_template(TEMPLATES['paragraph'], text=project['description'])
+
+    languages = resume_data.get('languages') or []
+    if languages:
+        yield from render_template(TEMPLATES['section'], title='LANGUAGES')
+        lang_list = []
+        for lang in languages:
+            if isinstance(lang, dict):
+                lang_list.append(f"{lang.get('language', '')} ({lang.get('proficiency', '')})")
+            else:
+                lang_list.append(str(lang))
+        yield from render_template(TEMPLATES['paragraph'], text=', '.join(lang_list))
+
+    certifications = resume_data.get('certifications') or []
+    if certifications:
+        yield from render_template(TEMPLATES['section'], title='CERTIFICATIONS')
+        for cert in certifications:
+            if isinstance(cert, dict):
+                details = _details((' -- ', cert.get('issuer')), (' \\textbar{} ', cert.get('year')))
+                yield from render_template(TEMPLATES['entry'], title=cert.get('name', ''), details=details)
+            else:
+                yield from render_template(TEMPLATES['paragraph'], text=cert)
+
+    yield from render_template(TEMPLATES['end'])
+
+class LatexCompilePool:
+    def __init__(self, command, workers, timeout, queue_timeout):
+        self.command = command
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='latex')
+        self._format_lock = threading.Lock()
+        self._format_checked = False
+        self._format_path = None
+
+    def _workdir(self):
+        # Each worker thread keeps its scratch directory for its whole life
+        if not hasattr(self._local, 'workdir'):
+            self._local.workdir = tempfile.mkdtemp(prefix='latex-worker-')
+        return self._local.workdir
+
+    def _dump_format(self):
+        formatdir = tempfile.mkdtemp(prefix='latex-format-')
+        with open(os.path.join(formatdir, 'preamble.tex'), 'w', encoding='utf-8') as f:
+            f.write(FORMAT_PREAMBLE)
+
+        base_format = os.path.splitext(os.path.basename(self.command))[0]
+        try:
+            result = subprocess.run(
+                [self.command, '-ini', '-interaction=nonstopmode', '-halt-on-error', '-no-shell-escape',
+                 '-jobname=resume-fmt', f'&{base_format}', 'preamble.tex\\dump'],
+                cwd=formatdir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"LaTeX format dump failed, compiling without it: {str(e)}")
+            return None
+
+        format_path = os.path.join(formatdir, 'resume-fmt.fmt')
+        if result.returncode != 0 or not os.path.exists(format_path):
+            logger.warning("LaTeX format dump failed, compiling without it: "
+                           + result.stdout.decode('utf-8', 'replace')[-500:])
+            return None
+        return os.path.splitext(format_path)[0]
+
+    def _format(self):
+        # Dumped once per pool; on failure every compile falls back to loading the full preamble
+        if not self._format_checked:
+            with self._format_lock:
+                if not self._format_checked:
+                    self._format_path = self._dump_format()
+                    self._format_checked = True
+        return self._format_path
+
+    def _compile(self, tex, output_path=None):
+        workdir = self._workdir()
+        tex_path = os.path.join(workdir, 'resume.tex')
+        pdf_path = os.path.join(workdir, 'resume.pdf')
+
+        command = [self.command, '-interaction=nonstopmode', '-halt-on-error', '-no-shell-escape']
+        format_path = self._format()
+        if format_path and tex.startswith(FORMAT_PREAMBLE):
+            command.append(f'-fmt={format_path}')
+            tex = tex[len(FORMAT_PREAMBLE):]
+        command.append('resume.tex')
+
+        with open(tex_path, 'w', encoding='utf-8') as f:
+            f.write(tex)
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)
+
+        try:
+            result = subprocess.run(
+                command,
+                cwd=workdir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise RenderLimitExceeded('LaTeX compilation took too long')
+
+        if result.returncode != 0 or not os.path.exists(pdf_path):
+            raise LatexCompileError(result.stdout.decode('utf-8', 'replace')[-2000:])
+
+        if output_path is not None:
+            shutil.move(pdf_path, output_path)
+            return output_path
+
+        with open(pdf_path, 'rb') as f:
+            return BytesIO(f.read())
+
+    def _run(self, started, tex, output_path):
+        started.set()
+        return self._compile(tex, output_path)
+
+    def compile(self, tex, output_path=None):
+        started = threading.Event()
+        future = self._executor.submit(self._run, started, tex, output_path)
+
+        # Only the queue wait needs bounding here, the compile itself is bounded by self.timeout
+        if not started.wait(self.queue_timeout) and future.cancel():
+            raise LatexPoolBusy('All LaTeX compile workers are busy')
+        return future.result()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_compile_pool():
+    global _pool
+
+    if _pool is None:
+        command = shutil.which(Config.LATEX_COMMAND)
+        if not command:
+            return None
+        with _pool_lock:
+            if _pool is None:
+                _pool = LatexCompilePool(
+                    command, Config.LATEX_WORKERS, Config.LATEX_TIMEOUT_SECONDS, Config.LATEX_QUEUE_TIMEOUT_SECONDS
+                )
+    return _pool
+
+if __name__ == '__main__':
+    import timeit
+
+    sample = {
+        'full_name': 'Jane Doe',
+        'user_email': 'jane@example.com',
+        'phone': '+1 555 0100',
+        'social_links': {'github': 'https://github.com/jane_doe'},
+        'profile_summary': 'Engineer & writer, 100% focused on {reliable} systems. ' * 20,
+        'education': [{'degree': 'BSc', 'institution': 'State University', 'year': '2015'}] * 3,
+        'technical_skills': {'Languages': ['Python', 'C#', 'C++'], 'Tools': ['Docker', 'MySQL']},
+        'work_experience': [{
+            'title': 'Engineer', 'company': 'Acme', 'period': '2016 - 2024',
+            'description': 'Built $scale services with ~50 ms p99 latency. ' * 10
+        }] * 15,
+        'projects': [{'name': 'resume_builder', 'technologies': 'Flask', 'description': 'PDF & LaTeX output. ' * 5}] * 10,
+        'languages': [{'language': 'English', 'proficiency': 'Native'}],
+        'certifications': [{'name': 'AWS SA', 'issuer': 'Amazon', 'year': '2020'}],
+    }
+
+    runs = 1000
+    compile_seconds = timeit.timeit(
+        lambda: {name: compile_template(source) for name, source in TEMPLATE_SOURCES.items()}, number=runs
+    )
+    render_seconds = timeit.timeit(lambda: ''.join(generate_resume_tex(sample)), number=runs)
+
+    print(f"Template compile: {compile_seconds / runs * 1e6:.1f} us (once at import)")
+    print(f"Render .tex:      {render_seconds / runs * 1e6:.1f} us per resume")
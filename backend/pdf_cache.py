@@ -0,0 +1,166 @@
+import os
+import time
+import uuid
+from config import Config
+from database import get_db_cursor
+from renderers import RENDERERS
+
+TMP_FILE_MAX_AGE_SECONDS = 3600
+PRUNE_LOOKUP_BATCH_SIZE = 500
+
+def normalize_resume_id(resume_id):
+    # Resume ids become file names, so anything that is not a UUID is rejected
+    try:
+        return str(uuid.UUID(resume_id))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def cache_path(resume_id, renderer):
+    return os.path.join(Config.PDF_CACHE_DIR, f"{resume_id}-{renderer.name}.{renderer.extension}")
+
+def get_cached_file(resume_id, renderer):
+    path = cache_path(resume_id, renderer)
+    try:
+        # atime is the last-used time for pruning; mtime stays put since ETag and Last-Modified derive from it
+        os.utime(path, (time.time(), os.stat(path).st_mtime))
+    except FileNotFoundError:
+        return None
+    return path
+
+def store_rendered_file(resume_id, renderer, resume_data):
+    os.makedirs(Config.PDF_CACHE_DIR, exist_ok=True)
+    path = cache_path(resume_id, renderer)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        renderer.render_to_file(resume_data, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+def invalidate_cached_files(resume_ids):
+    for resume_id in resume_ids:
+        for renderer in RENDERERS.values():
+            if renderer.cacheable:
+                try:
+                    os.remove(cache_path(resume_id, renderer))
+                except FileNotFoundError:
+                    pass
+
+def _existing_resume_ids(resume_ids):
+    existing = set()
+    resume_ids = list(resume_ids)
+
+    # Primary, not a replica: a lagging replica would still list freshly deleted resumes
+    with get_db_cursor() as cursor:
+        for start in range(0, len(resume_ids), PRUNE_LOOKUP_BATCH_SIZE):
+            batch = resume_ids[start:start + PRUNE_LOOKUP_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"SELECT id FROM resumes WHERE id IN ({placeholders})", batch)
+            existing.update(row['id'] for row in cursor.fetchall())
+
+    return existing
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def prune_cache():
+    try:
+        names = os.listdir(Config.PDF_CACHE_DIR)
+    except FileNotFoundError:
+        return 0
+
+    now = time.time()
+    max_age = Config.PDF_CACHE_MAX_AGE_HOURS * 3600
+    removed = 0
+    entries = []
+
+    for name in names:
+        path = os.path.join(Config.PDF_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+
+        if name.endswith('.tmp'):
+            if now - stat.st_mtime > TMP_FILE_MAX_AGE_SECONDS:
+                removed += _remove(path)
+        elif now - stat.st_atime > max_age or not normalize_resume_id(name[:36]):
+            removed += _remove(path)
+        else:
+            entries.append((stat.st_atime, stat.st_size, name[:36], path))
+
+    # Files for deleted resumes, e.g. written by a render that finished after the delete committed
+    existing = _existing_resume_ids({entry[2] for entry in entries})
+    kept = []
+    for entry in entries:
+        if entry[2] in existing:
+            kept.append(entry)
+        else:
+            removed += _remove(entry[3])
+
+    # Least recently used first until the cache fits its size budget
+    total_size = sum(entry[1] for entry in kept)
+    max_size = Config.PDF_CACHE_MAX_MB * 1024 * 1024
+    for atime, size, resume_id, path in sorted(kept):
+        if total_size <= max_size:
+            break
+        removed += _remove(path)
+        total_size -= size
+
+    return removed
+
+if __name__ == '__main__':
+    import resource
+    import subprocess
+    import sys
+    import tempfile
+    import threading
+
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    if len(sys.argv) < 2:
+        # Each mode runs in a fresh process so ru_maxrss is not shared between them
+        for mode in ('memory', 'file'):
+            subprocess.run([sys.executable, __file__, mode, str(concurrency)], check=True)
+        sys.exit(0)
+
+    mode = sys.argv[1]
+    renderer = RENDERERS['pdf']
+    sample = {
+        'full_name': 'Jane Doe',
+        'user_email': 'jane@example.com',
+        'profile_summary': 'Builds reliable backend systems. ' * 100,
+        'technical_skills': {'Languages': ['Python', 'Go', 'SQL'] * 10},
+        'work_experience': [{
+            'title': 'Engineer', 'company': 'Acme', 'period': '2016 - 2024',
+            'description': 'Designed and operated high traffic services. ' * 20
+        }] * 20,
+    }
+
+    renderer.render(sample)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    workdir = tempfile.mkdtemp()
+
+    def download(i):
+        if mode == 'memory':
+            renderer.render(sample).getvalue()
+        else:
+            renderer.render_to_file(sample, os.path.join(workdir, f'{i}.pdf'))
+
+    threads = [threading.Thread(target=download, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode}: {concurrency} concurrent downloads, peak RSS +{(peak - baseline) / 1024:.1f} MB "
+          f"({(peak - baseline) / concurrency:.0f} KB per download)")
@@ -5,11 +5,31 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.lib import colors
 from io import BytesIO
+import time
+from config import Config
 
-def generate_resume_pdf(resume_data):
-    buffer = BytesIO()
+class RenderLimitExceeded(Exception):
+    pass
 
-    doc = SimpleDocTemplate(
+class BudgetedDocTemplate(SimpleDocTemplate):
+    def __init__(self, *args, max_pages=None, max_seconds=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_pages = max_pages or Config.MAX_RENDER_PAGES
+        self.deadline = time.monotonic() + (max_seconds or Config.MAX_RENDER_SECONDS)
+
+    def handle_pageBegin(self):
+        super().handle_pageBegin()
+        if self.page > self.max_pages:
+            raise RenderLimitExceeded(f'Resume exceeds {self.max_pages} pages')
+
+    def afterFlowable(self, flowable):
+        if time.monotonic() > self.deadline:
+            raise RenderLimitExceeded('Resume took too long to render')
+
+def generate_resume_pdf(resume_data, output=None):
+    buffer = output or BytesIO()
+
+    doc = BudgetedDocTemplate(
         buffer,
         pagesize=letter,
         rightMargin=0.75*inch,
@@ -187,5 +207,7 @@ def generate_resume_pdf(resume_data):
                 story.append(Paragraph(str(cert), body_style))
 
     doc.build(story)
+    if output is not None:
+        return output
     buffer.seek(0)
     return buffer
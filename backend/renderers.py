@@ -0,0 +1,61 @@
+from pdf_generator import generate_resume_pdf
+from latex_generator import generate_resume_tex, get_compile_pool
+
+class Renderer:
+    name = None
+    mimetype = None
+    extension = None
+    streaming = False
+    cacheable = False
+
+    def available(self):
+        return True
+
+    def render(self, resume_data):
+        raise NotImplementedError
+
+    def render_to_file(self, resume_data, path):
+        raise NotImplementedError
+
+class ReportLabRenderer(Renderer):
+    name = 'pdf'
+    mimetype = 'application/pdf'
+    extension = 'pdf'
+    cacheable = True
+
+    def render(self, resume_data):
+        return generate_resume_pdf(resume_data)
+
+    def render_to_file(self, resume_data, path):
+        return generate_resume_pdf(resume_data, path)
+
+class LatexSourceRenderer(Renderer):
+    name = 'tex'
+    mimetype = 'application/x-tex'
+    extension = 'tex'
+    streaming = True
+
+    def render(self, resume_data):
+        return generate_resume_tex(resume_data)
+
+class LatexPdfRenderer(Renderer):
+    name = 'latex'
+    mimetype = 'application/pdf'
+    extension = 'pdf'
+    cacheable = True
+
+    def available(self):
+        return get_compile_pool() is not None
+
+    def render(self, resume_data):
+        return get_compile_pool().compile(''.join(generate_resume_tex(resume_data)))
+
+    def render_to_file(self, resume_data, path):
+        return get_compile_pool().compile(''.join(generate_resume_tex(resume_data)), path)
+
+DEFAULT_FORMAT = 'pdf'
+
+RENDERERS = {renderer.name: renderer for renderer in (ReportLabRenderer(), LatexSourceRenderer(), LatexPdfRenderer())}
+
+def get_renderer(fmt=None):
+    return RENDERERS.get(fmt or DEFAULT_FORMAT)
@@ -0,0 +1,122 @@
+import json
+from datetime import datetime
+from database import get_db_cursor
+
+SCALAR_FIELDS = ('id', 'user_email', 'full_name', 'phone', 'profile_summary', 'created_at', 'updated_at')
+JSON_FIELDS = ('social_links', 'education', 'technical_skills', 'work_experience', 'projects', 'languages', 'certifications')
+DICT_FIELDS = ('social_links', 'technical_skills')
+RESUME_COLUMNS = SCALAR_FIELDS + JSON_FIELDS
+
+class ResumeRecord:
+    __slots__ = SCALAR_FIELDS + ('_raw', '_decoded')
+
+    def __init__(self, row):
+        for field in SCALAR_FIELDS:
+            setattr(self, field, row.get(field))
+        # Sections stay as the JSON text MySQL returned until something reads them
+        self._raw = {field: row.get(field) for field in JSON_FIELDS}
+        self._decoded = {}
+
+    def section(self, name):
+        if name not in self._decoded:
+            raw = self._raw[name]
+            if raw:
+                self._decoded[name] = json.loads(raw)
+            else:
+                self._decoded[name] = {} if name in DICT_FIELDS else []
+        return self._decoded[name]
+
+    def raw_section(self, name):
+        raw = self._raw[name]
+        return raw.decode('utf-8') if isinstance(raw, bytes) else raw
+
+    def get(self, key, default=None):
+        if key in self._raw:
+            return self.section(key) if self._raw[key] else default
+        value = getattr(self, key, None) if key in SCALAR_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key in self._raw:
+            return self.section(key)
+        if key in SCALAR_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_json(self):
+        members = {}
+        for field in SCALAR_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            members[field] = json.dumps(value)
+        for field in JSON_FIELDS:
+            raw = self.raw_section(field)
+            members[field] = raw if raw else json.dumps(raw)
+
+        return '{' + ','.join(f'{json.dumps(k)}:{members[k]}' for k in sorted(members)) + '}'
+
+def fetch_resume(resume_id, columns=RESUME_COLUMNS):
+    with get_db_cursor(readonly=True) as cursor:
+        cursor.execute(f"SELECT {', '.join(columns)} FROM resumes WHERE id = %s", (resume_id,))
+        row = cursor.fetchone()
+
+    return ResumeRecord(row) if row else None
+
+if __name__ == '__main__':
+    import timeit
+    import tracemalloc
+
+    item = {'title': 'Engineer', 'company': 'Acme', 'period': '2016 - 2024',
+            'description': 'Designed and operated high traffic services. ' * 20}
+    row = {
+        'id': 'b7f1c0de-0000-4000-8000-000000000000',
+        'user_email': 'jane@example.com',
+        'full_name': 'Jane Doe',
+        'phone': '+1 555 0100',
+        'profile_summary': 'Builds reliable backend systems. ' * 100,
+        'created_at': datetime(2024, 1, 1),
+        'updated_at': datetime(2024, 1, 1),
+        'social_links': json.dumps({'github': 'https://github.com/jane'}),
+        'education': json.dumps([{'degree': 'BSc', 'institution': 'State', 'year': '2015'}] * 5),
+        'technical_skills': json.dumps({'Languages': ['Python', 'Go', 'SQL'] * 20}),
+        'work_experience': json.dumps([item] * 30),
+        'projects': json.dumps([dict(item, name='resume_builder')] * 30),
+        'languages': json.dumps([{'language': 'English', 'proficiency': 'Native'}]),
+        'certifications': json.dumps([{'name': 'AWS SA', 'issuer': 'Amazon', 'year': '2020'}] * 10),
+    }
+
+    def eager_passthrough():
+        resume = dict(row)
+        for field in JSON_FIELDS:
+            if resume.get(field):
+                resume[field] = json.loads(resume[field])
+        for field in ('created_at', 'updated_at'):
+            resume[field] = resume[field].isoformat()
+        return json.dumps(resume, sort_keys=True)
+
+    def lazy_passthrough():
+        return ResumeRecord(row).to_json()
+
+    def eager_cache_hit():
+        resume = dict(row)
+        for field in JSON_FIELDS:
+            if resume.get(field):
+                resume[field] = json.loads(resume[field])
+        return resume['full_name']
+
+    def lazy_cache_hit():
+        return ResumeRecord(row).full_name
+
+    runs = 2000
+    for name, eager, lazy in (('resume details', eager_passthrough, lazy_passthrough),
+                              ('cached PDF download', eager_cache_hit, lazy_cache_hit)):
+        results = []
+        for fn in (eager, lazy):
+            seconds = timeit.timeit(fn, number=runs) / runs
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append(f"{seconds * 1e6:8.1f} us {peak / 1024:7.1f} KB peak")
+        print(f"{name:20} eager: {results[0]} | lazy: {results[1]}")
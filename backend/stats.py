@@ -0,0 +1,167 @@
+import json
+from database import get_db_cursor
+
+BACKFILL_BATCH_SIZE = 1000
+
+def extract_skills(technical_skills):
+    if isinstance(technical_skills, str):
+        technical_skills = json.loads(technical_skills) if technical_skills else {}
+    if not isinstance(technical_skills, dict):
+        return []
+
+    skills = set()
+    for value in technical_skills.values():
+        items = value if isinstance(value, list) else str(value or '').split(',')
+        for item in items:
+            skill = str(item or '').lower()[:255].strip()
+            if skill:
+                skills.add(skill)
+
+    # Sorted so concurrent transactions lock rollup rows in the same order
+    return sorted(skills)
+
+def email_domain(email):
+    return (email or '').rsplit('@', 1)[-1].lower()[:255].strip()
+
+def _aggregate(rows, daily, skills, domains):
+    for row in rows:
+        day = row['created_at'].date()
+        daily[day] = daily.get(day, 0) + 1
+        for skill in extract_skills(row['technical_skills']):
+            skills[skill] = skills.get(skill, 0) + 1
+        domain = email_domain(row['user_email'])
+        domains[domain] = domains.get(domain, 0) + 1
+
+def _increment(cursor, table, column, keys):
+    if keys:
+        cursor.executemany(
+            f"INSERT INTO {table} ({column}, total) VALUES (%s, 1) "
+            f"ON DUPLICATE KEY UPDATE total = total + 1",
+            [(key,) for key in keys]
+        )
+
+def _decrement(cursor, table, column, counts):
+    if counts:
+        cursor.executemany(
+            f"UPDATE {table} SET total = total - %s WHERE {column} = %s",
+            [(count, key) for key, count in sorted(counts.items())]
+        )
+        keys = list(counts)
+        placeholders = ', '.join(['%s'] * len(keys))
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders}) AND total <= 0", keys)
+
+def _adjust_total(cursor, delta):
+    cursor.execute(
+        """
+        INSERT INTO submission_counters (name, value) VALUES ('resumes_total', %s)
+        ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+        """,
+        (delta,)
+    )
+
+def record_resume_added(cursor, resume_id, user_email, technical_skills):
+    # Same DATE(created_at) that deletes and rebuild_rollups use, so the day always matches
+    cursor.execute(
+        """
+        INSERT INTO resume_daily_counts (day, total)
+        SELECT DATE(created_at), 1 FROM resumes WHERE id = %s
+        ON DUPLICATE KEY UPDATE total = total + 1
+        """,
+        (resume_id,)
+    )
+    _increment(cursor, 'resume_skill_counts', 'skill', extract_skills(technical_skills))
+    _increment(cursor, 'resume_domain_counts', 'domain', [email_domain(user_email)])
+    _adjust_total(cursor, 1)
+
+def record_resumes_removed(cursor, rows):
+    daily, skills, domains = {}, {}, {}
+    _aggregate(rows, daily, skills, domains)
+
+    _decrement(cursor, 'resume_daily_counts', 'day', daily)
+    _decrement(cursor, 'resume_skill_counts', 'skill', skills)
+    _decrement(cursor, 'resume_domain_counts', 'domain', domains)
+    if rows:
+        _adjust_total(cursor, -len(rows))
+
+def get_dashboard_stats(days=30, top=10):
+    with get_db_cursor(readonly=True) as cursor:
+        cursor.execute("SELECT value FROM submission_counters WHERE name = 'resumes_total'")
+        row = cursor.fetchone()
+        total = int(row['value']) if row else 0
+
+        cursor.execute(
+            """
+            SELECT day, total FROM resume_daily_counts
+            WHERE day > DATE_SUB(CURDATE(), INTERVAL %s DAY)
+            ORDER BY day
+            """,
+            (days,)
+        )
+        daily = [{'day': r['day'].isoformat(), 'count': r['total']} for r in cursor.fetchall()]
+
+        cursor.execute("SELECT skill, total FROM resume_skill_counts ORDER BY total DESC LIMIT %s", (top,))
+        skills = [{'skill': r['skill'], 'count': r['total']} for r in cursor.fetchall()]
+
+        cursor.execute("SELECT domain, total FROM resume_domain_counts ORDER BY total DESC LIMIT %s", (top,))
+        domains = [{'domain': r['domain'], 'count': r['total']} for r in cursor.fetchall()]
+
+    return {
+        'total_resumes': total,
+        'submissions_per_day': daily,
+        'top_skills': skills,
+        'top_email_domains': domains
+    }
+
+def rebuild_rollups():
+    daily, skills, domains = {}, {}, {}
+    total = 0
+
+    # One transaction with locking reads, so submissions wait instead of being missed or double counted
+    with get_db_cursor(commit=True) as cursor:
+        last_id = ''
+        while True:
+            cursor.execute(
+                """
+                SELECT id, created_at, user_email, technical_skills
+                FROM resumes
+                WHERE id > %s
+                ORDER BY id
+                LIMIT %s
+                LOCK IN SHARE MODE
+                """,
+                (last_id, BACKFILL_BATCH_SIZE)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            _aggregate(rows, daily, skills, domains)
+            total += len(rows)
+            last_id = rows[-1]['id']
+
+        for table, column, counts in (
+            ('resume_daily_counts', 'day', daily),
+            ('resume_skill_counts', 'skill', skills),
+            ('resume_domain_counts', 'domain', domains),
+        ):
+            cursor.execute(f"DELETE FROM {table}")
+            if counts:
+                cursor.executemany(
+                    f"INSERT INTO {table} ({column}, total) VALUES (%s, %s) "
+                    f"ON DUPLICATE KEY UPDATE total = total + VALUES(total)",
+                    list(counts.items())
+                )
+
+        cursor.execute(
+            """
+            INSERT INTO submission_counters (name, value) VALUES ('resumes_total', %s)
+            ON DUPLICATE KEY UPDATE value = VALUES(value)
+            """,
+            (total,)
+        )
+
+    return total
+
+if __name__ == '__main__':
+    rebuilt = rebuild_rollups()
+    print(f"Rebuilt dashboard statistics from {rebuilt} resumes")
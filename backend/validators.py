@@ -1,6 +1,14 @@
+import math
 import re
 import bleach
 from email_validator import validate_email, EmailNotValidError
+from config import Config
+
+LIST_SECTIONS = ['education', 'work_experience', 'projects', 'languages', 'certifications']
+
+# Body text is 10pt Helvetica on a 7in x 9.5in frame
+CHARS_PER_LINE = 110
+LINES_PER_PAGE = 57
 
 def sanitize_text(text):
     if text is None:
@@ -32,6 +40,99 @@ def validate_url(url):
         r'(?:/?|[/?]\S+)$', re.IGNORECASE)
     return bool(url_pattern.match(url))
 
+def _text_values(value):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield str(k)
+            yield from _text_values(v)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _text_values(item)
+    elif value is not None:
+        yield str(value)
+
+def _paragraph_lines(text):
+    return max(1, math.ceil(len(text) / CHARS_PER_LINE)) + 0.5
+
+def estimate_render_cost(data):
+    items = 0
+    skills = 0
+    longest_field = 0
+    text_length = 0
+    lines = 4
+
+    for text in _text_values(data):
+        text_length += len(text)
+        longest_field = max(longest_field, len(text))
+
+    if data.get('profile_summary'):
+        lines += 2.5 + _paragraph_lines(str(data['profile_summary']))
+
+    for field in LIST_SECTIONS:
+        section = data.get(field)
+        if isinstance(section, list) and section:
+            items += len(section)
+            lines += 2.5
+            for item in section:
+                # Every field but the description shares one header paragraph
+                if isinstance(item, dict):
+                    header = ' '.join(_text_values({k: v for k, v in item.items() if k != 'description'}))
+                    lines += _paragraph_lines(header)
+                    if item.get('description'):
+                        lines += _paragraph_lines(str(item['description']))
+                else:
+                    lines += _paragraph_lines(' '.join(_text_values(item)))
+
+    technical_skills = data.get('technical_skills')
+    if isinstance(technical_skills, dict) and technical_skills:
+        lines += 2.5
+        for category, values in technical_skills.items():
+            category_skills = values if isinstance(values, list) else [values]
+            skills += len(category_skills)
+            lines += _paragraph_lines(' '.join(str(v) for v in [category] + category_skills))
+
+    return {
+        'items': items,
+        'skills': skills,
+        'longest_field': longest_field,
+        'text_length': text_length,
+        'estimated_pages': math.ceil(lines / LINES_PER_PAGE)
+    }
+
+def check_render_budget(data):
+    errors = []
+
+    for field in LIST_SECTIONS:
+        section = data.get(field)
+        if section is not None and not isinstance(section, list):
+            errors.append(f'{field} must be a list')
+        elif section and len(section) > Config.MAX_SECTION_ITEMS:
+            errors.append(f'Too many {field} entries (max {Config.MAX_SECTION_ITEMS})')
+
+    technical_skills = data.get('technical_skills')
+    if technical_skills is not None and not isinstance(technical_skills, dict):
+        errors.append('technical_skills must be an object')
+
+    social_links = data.get('social_links')
+    if social_links is not None and not isinstance(social_links, dict):
+        errors.append('social_links must be an object')
+
+    if errors:
+        return errors
+
+    cost = estimate_render_cost(data)
+
+    if cost['skills'] > Config.MAX_SKILLS:
+        errors.append(f'Too many technical skills (max {Config.MAX_SKILLS})')
+    if cost['longest_field'] > Config.MAX_FIELD_LENGTH:
+        errors.append(f'A field is too long (max {Config.MAX_FIELD_LENGTH} characters)')
+    if cost['text_length'] > Config.MAX_TEXT_LENGTH:
+        errors.append(f'Resume has too much text (max {Config.MAX_TEXT_LENGTH} characters)')
+    if cost['estimated_pages'] > Config.MAX_ESTIMATED_PAGES:
+        errors.append(f'Resume is too long (estimated {cost["estimated_pages"]} pages, max {Config.MAX_ESTIMATED_PAGES})')
+
+    return errors
+
 def validate_resume_data(data):
     errors = []
 
@@ -58,6 +159,8 @@ def validate_resume_data(data):
     if profile_summary and len(profile_summary) > 5000:
         errors.append('Profile summary is too long (max 5000 characters)')
 
+    errors.extend(check_render_budget(data))
+
     return errors
 
 def sanitize_resume_data(data):
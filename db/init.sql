@@ -23,10 +23,12 @@ CREATE TABLE IF NOT EXISTS `resumes` (
   `projects` JSON,
   `languages` JSON,
   `certifications` JSON,
+  `content_hash` CHAR(64) NULL,
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   INDEX `idx_created` (`created_at` DESC),
-  INDEX `idx_email` (`user_email`)
+  INDEX `idx_email` (`user_email`),
+  UNIQUE INDEX `idx_content_hash` (`content_hash`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE IF NOT EXISTS `admin_sessions` (
@@ -39,3 +41,48 @@ CREATE TABLE IF NOT EXISTS `admin_sessions` (
   INDEX `idx_token` (`session_token`),
   INDEX `idx_expires` (`expires_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `idempotency_keys` (
+  `idempotency_key` VARCHAR(255) PRIMARY KEY,
+  `resume_id` VARCHAR(36) NOT NULL,
+  `content_hash` CHAR(64) NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX `idx_created` (`created_at`),
+  INDEX `idx_resume` (`resume_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `submission_counters` (
+  `name` VARCHAR(64) PRIMARY KEY,
+  `value` BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `resume_daily_counts` (
+  `day` DATE PRIMARY KEY,
+  `total` INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `resume_skill_counts` (
+  `skill` VARCHAR(255) COLLATE utf8mb4_bin PRIMARY KEY,
+  `total` INT NOT NULL DEFAULT 0,
+  INDEX `idx_total` (`total` DESC)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `resume_domain_counts` (
+  `domain` VARCHAR(255) COLLATE utf8mb4_bin PRIMARY KEY,
+  `total` INT NOT NULL DEFAULT 0,
+  INDEX `idx_total` (`total` DESC)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `bulk_delete_jobs` (
+  `id` VARCHAR(36) PRIMARY KEY,
+  `admin_id` VARCHAR(36) NOT NULL,
+  `criteria` JSON NOT NULL,
+  `requested` INT NULL,
+  `deleted` INT NOT NULL DEFAULT 0,
+  `chunks` INT NOT NULL DEFAULT 0,
+  `scanned_through` VARCHAR(36) NULL,
+  `status` VARCHAR(20) NOT NULL,
+  `error` TEXT,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
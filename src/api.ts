@@ -9,6 +9,25 @@ export class ApiError extends Error {
   }
 }
 
+const LAST_WRITE_KEY = 'lastWriteToken';
+
+// Echo the server's last-write token so reads right after our own writes see them
+async function apiFetch(url: string, init: RequestInit = {}) {
+  const headers = new Headers(init.headers);
+  const lastWrite = sessionStorage.getItem(LAST_WRITE_KEY);
+  if (lastWrite) {
+    headers.set('X-Last-Write', lastWrite);
+  }
+
+  const response = await fetch(url, { ...init, headers });
+
+  const token = response.headers.get('X-Last-Write');
+  if (token) {
+    sessionStorage.setItem(LAST_WRITE_KEY, token);
+  }
+  return response;
+}
+
 async function handleResponse(response: Response) {
   if (!response.ok) {
     const error = await response.json().catch(() => ({ error: 'An error occurred' }));
@@ -18,7 +37,7 @@ async function handleResponse(response: Response) {
 }
 
 export async function submitResume(data: ResumeData) {
-  const response = await fetch(`${API_BASE_URL}/resumes`, {
+  const response = await apiFetch(`${API_BASE_URL}/resumes`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -29,7 +48,7 @@ export async function submitResume(data: ResumeData) {
 }
 
 export async function downloadResumePDF(resumeId: string) {
-  const response = await fetch(`${API_BASE_URL}/resumes/${resumeId}/pdf`);
+  const response = await apiFetch(`${API_BASE_URL}/resumes/${resumeId}/pdf`);
 
   if (!response.ok) {
     throw new ApiError(response.status, 'Failed to download PDF');
@@ -47,7 +66,7 @@ export async function downloadResumePDF(resumeId: string) {
 }
 
 export async function adminLogin(email: string, password: string) {
-  const response = await fetch(`${API_BASE_URL}/admin/login`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/login`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -58,7 +77,7 @@ export async function adminLogin(email: string, password: string) {
 }
 
 export async function adminLogout(sessionToken: string) {
-  const response = await fetch(`${API_BASE_URL}/admin/logout`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/logout`, {
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${sessionToken}`,
@@ -68,7 +87,7 @@ export async function adminLogout(sessionToken: string) {
 }
 
 export async function getAllResumes(sessionToken: string, page = 1, perPage = 20) {
-  const response = await fetch(`${API_BASE_URL}/admin/resumes?page=${page}&per_page=${perPage}`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/resumes?page=${page}&per_page=${perPage}`, {
     headers: {
       'Authorization': `Bearer ${sessionToken}`,
     },
@@ -77,7 +96,7 @@ export async function getAllResumes(sessionToken: string, page = 1, perPage = 20
 }
 
 export async function getResumeById(sessionToken: string, resumeId: string) {
-  const response = await fetch(`${API_BASE_URL}/admin/resumes/${resumeId}`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/resumes/${resumeId}`, {
     headers: {
       'Authorization': `Bearer ${sessionToken}`,
     },
@@ -86,7 +105,7 @@ export async function getResumeById(sessionToken: string, resumeId: string) {
 }
 
 export async function downloadResumeAsAdmin(sessionToken: string, resumeId: string, fullName: string) {
-  const response = await fetch(`${API_BASE_URL}/admin/resumes/${resumeId}/pdf`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/resumes/${resumeId}/pdf`, {
     headers: {
       'Authorization': `Bearer ${sessionToken}`,
     },
@@ -108,7 +127,7 @@ export async function downloadResumeAsAdmin(sessionToken: string, resumeId: stri
 }
 
 export async function deleteResume(sessionToken: string, resumeId: string) {
-  const response = await fetch(`${API_BASE_URL}/admin/resumes/${resumeId}`, {
+  const response = await apiFetch(`${API_BASE_URL}/admin/resumes/${resumeId}`, {
     method: 'DELETE',
     headers: {
       'Authorization': `Bearer ${sessionToken}`,